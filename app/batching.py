@@ -0,0 +1,101 @@
+"""
+Request coalescing for batch-capable model calls.
+Collects items submitted by concurrent requests and runs them through a
+single batched call, so high-QPS traffic shares one model invocation.
+"""
+import asyncio
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-item submissions into batched calls."""
+
+    def __init__(self,
+                 batch_fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 64,
+                 max_wait: float = 0.005):
+        """Initialize the batcher.
+
+        Args:
+            batch_fn: Function mapping a list of items to a list of results
+                (one per item, in order). Runs in a worker thread.
+            max_batch_size: Maximum number of items per batched call
+            max_wait: Seconds to wait for more items after the first arrives
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._batch: List[Tuple[Any, asyncio.Future]] = []
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result from the next batch."""
+        loop = asyncio.get_running_loop()
+        if (self._worker is None or self._worker.done()
+                or self._worker.get_loop() is not loop):
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the background worker, if running.
+
+        Requests still queued or in the batch being processed fail with a
+        RuntimeError instead of waiting forever.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        pending = self._batch
+        self._batch = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._fail(pending, RuntimeError("MicroBatcher was closed"))
+
+    @staticmethod
+    def _fail(batch: List[Tuple[Any, asyncio.Future]], error: BaseException) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Block until the first item arrives, then gather more until the
+            # batch is full or the deadline passes
+            self._batch = batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            items = [item for item, _ in batch]
+            try:
+                results = await asyncio.to_thread(self.batch_fn, items)
+            except Exception as e:
+                self._fail(batch, e)
+                self._batch = []
+                continue
+
+            if len(results) != len(batch):
+                self._fail(batch, RuntimeError(
+                    f"batch_fn returned {len(results)} results for {len(batch)} items"))
+            else:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            self._batch = []
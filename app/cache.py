@@ -0,0 +1,41 @@
+"""
+Bounded in-memory cache for pure, repeatable results.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with a fixed maximum size."""
+
+    def __init__(self, maxsize: int = 100_000):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the
+                least recently used one
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if it is not cached."""
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the oldest entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -3,12 +3,23 @@ Data processing module for the English-Shona language identification project.
 Handles loading, cleaning, and splitting the dataset for model training.
 """
 import os
+import re
+import json
+from itertools import islice
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
 from pathlib import Path
-from typing import Tuple, Dict, List, Optional
-from sklearn.model_selection import train_test_split
+from typing import Tuple, Dict, List, Optional, Iterator, Union
 import logging
 
+try:
+    import polars as pl
+except ImportError:  # polars is optional; fall back to pandas readers
+    pl = None
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -16,6 +27,105 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rows per chunk when streaming large files through the pipeline
+DEFAULT_CHUNKSIZE = 256_000
+
+# Zero-width characters (ZWSP, ZWNJ, ZWJ, direction marks, BOM) removed during
+# cleaning. Written as a non-raw string so the pattern holds the characters
+# themselves, which both Python's re and Arrow's RE2 string kernels accept.
+ZERO_WIDTH_RE = re.compile("[\u200b-\u200f\ufeff]+")
+
+
+def _allocate(class_counts: np.ndarray, n_total: int) -> np.ndarray:
+    """Split n_total across classes in proportion to their sizes.
+    
+    Uses largest-remainder rounding so the allocations sum to n_total exactly.
+    """
+    exact = class_counts * (n_total / class_counts.sum())
+    alloc = np.floor(exact).astype(np.int64)
+    remainder = n_total - int(alloc.sum())
+    if remainder > 0:
+        alloc[np.argsort(alloc - exact, kind="stable")[:remainder]] += 1
+    return alloc
+
+
+def _stratified_indices(labels: np.ndarray,
+                        test_size: float,
+                        val_size: float,
+                        rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute stratified train/validation/test row positions.
+    
+    Args:
+        labels: Integer class code for every row
+        test_size: Proportion of rows to use for testing
+        val_size: Proportion of the remaining rows to use for validation
+        rng: Random generator used for shuffling
+        
+    Returns:
+        Tuple of (train_idx, val_idx, test_idx) int64 position arrays;
+        val_idx is empty when val_size is 0
+    """
+    n = len(labels)
+    
+    # Shuffle once, then group positions by class with a stable sort so
+    # each class's positions stay in shuffled order
+    perm = rng.permutation(n)
+    grouped = perm[np.argsort(labels[perm], kind="stable")]
+    class_counts = np.bincount(labels)
+    class_starts = np.concatenate(([0], np.cumsum(class_counts)[:-1]))
+    
+    test_counts = _allocate(class_counts, int(round(test_size * n)))
+    remaining = class_counts - test_counts
+    val_counts = _allocate(remaining, int(round(val_size * remaining.sum())))
+    
+    train_parts, val_parts, test_parts = [], [], []
+    for start, n_class, n_test, n_val in zip(class_starts, class_counts, test_counts, val_counts):
+        class_idx = grouped[start:start + n_class]
+        test_parts.append(class_idx[:n_test])
+        val_parts.append(class_idx[n_test:n_test + n_val])
+        train_parts.append(class_idx[n_test + n_val:])
+    
+    # Shuffle within each split so classes are interleaved
+    return tuple(rng.permutation(np.concatenate(parts))
+                 for parts in (train_parts, val_parts, test_parts))
+
+
+def _read_json_lines(file_path: Path,
+                     chunksize: Optional[int] = None,
+                     text_column: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """Read a JSON Lines file in chunks of rows.
+    
+    Unlike pd.read_json, values in text_column are kept exactly as parsed
+    (e.g. 1 stays an int) instead of being coerced per chunk, where a chunk
+    of numbers and nulls would otherwise turn into floats.
+    
+    Args:
+        file_path: Path to the JSON Lines file
+        chunksize: Rows per chunk; the whole file is one chunk if None
+        text_column: Column whose values are kept as parsed
+        
+    Yields:
+        DataFrames with a continuous index across chunks
+    """
+    start = 0
+    with open(file_path, encoding="utf-8") as f:
+        while True:
+            lines = islice(f, chunksize) if chunksize else f
+            records = [json.loads(line) for line in lines if line.strip()]
+            if not records:
+                break
+            
+            df = pd.DataFrame(records, index=pd.RangeIndex(start, start + len(records)))
+            if text_column is not None and text_column in df.columns:
+                df[text_column] = pd.Series([record.get(text_column) for record in records],
+                                            index=df.index, dtype=object)
+            start += len(records)
+            yield df
+            
+            if not chunksize:
+                break
+
+
 class DataProcessor:
     """Handles loading, cleaning, and processing of the language dataset."""
     
@@ -34,45 +144,111 @@ class DataProcessor:
         for directory in [self.raw_dir, self.processed_dir, self.splits_dir]:
             directory.mkdir(parents=True, exist_ok=True)
     
-    def load_data(self, file_path: str) -> pd.DataFrame:
+    def load_data(self, file_path: str,
+                  chunksize: Optional[int] = None,
+                  text_column: Optional[str] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """Load the dataset from a file.
         
+        CSV and line-delimited JSON files are parsed with polars' multi-threaded
+        reader when it is installed, falling back to pandas otherwise.
+        
         Args:
-            file_path: Path to the data file (CSV, JSON, or Excel)
+            file_path: Path to the data file (CSV, JSON, JSON Lines, Parquet, or Excel)
+            chunksize: If set, stream CSV / JSON Lines files in chunks of this
+                many rows instead of loading them whole
+            text_column: If set, read this CSV / JSON Lines column as text
+                rather than inferring a type for it, so numeric-looking texts
+                come out the same however the file is read
             
         Returns:
-            DataFrame containing the loaded data
+            DataFrame containing the loaded data, or an iterator of DataFrames
+            when chunksize is set
         """
         file_path = Path(file_path)
         logger.info(f"Loading data from {file_path}")
         
+        csv_dtype = {text_column: str} if text_column is not None else None
+        
+        if chunksize is not None:
+            if file_path.suffix == '.csv':
+                return pd.read_csv(file_path, chunksize=chunksize, dtype=csv_dtype)
+            elif file_path.suffix == '.jsonl':
+                return _read_json_lines(file_path, chunksize, text_column)
+            else:
+                raise ValueError(f"Chunked loading is not supported for: {file_path.suffix}")
+        
+        schema_overrides = {text_column: pl.String} if pl is not None and text_column is not None else None
+        
         if file_path.suffix == '.csv':
-            return pd.read_csv(file_path)
+            if pl is not None:
+                # Infer the schema from all rows: by default polars looks at the
+                # first rows only and fails on a later value that doesn't fit
+                return pl.read_csv(file_path, infer_schema_length=None,
+                                   schema_overrides=schema_overrides).to_pandas()
+            return pd.read_csv(file_path, dtype=csv_dtype)
+        elif file_path.suffix == '.jsonl':
+            if pl is not None:
+                # Infer the schema from all rows, for the same reason as above
+                return pl.read_ndjson(file_path, infer_schema_length=None,
+                                      schema_overrides=schema_overrides).to_pandas()
+            return next(_read_json_lines(file_path, text_column=text_column), pd.DataFrame())
         elif file_path.suffix == '.json':
             return pd.read_json(file_path)
+        elif file_path.suffix == '.parquet':
+            return pd.read_parquet(file_path)
         elif file_path.suffix in ['.xlsx', '.xls']:
             return pd.read_excel(file_path)
         else:
             raise ValueError(f"Unsupported file format: {file_path.suffix}")
     
+    def load_data_mmap(self, file_path: str) -> pd.DataFrame:
+        """Load a CSV file through a memory map.
+        
+        The OS pages the file in on demand instead of it being read into a
+        Python buffer first, and Arrow buffers are released column by column
+        as the DataFrame is built, so peak memory stays close to the size of
+        the result rather than two to three times it. The conversion step is
+        slightly slower than load_data, so prefer this for files that are
+        large relative to available RAM.
+        
+        Args:
+            file_path: Path to the CSV file
+            
+        Returns:
+            DataFrame containing the loaded data
+        """
+        file_path = Path(file_path)
+        logger.info(f"Memory-mapping data from {file_path}")
+        
+        with pa.memory_map(str(file_path), "r") as source:
+            table = pa_csv.read_csv(source)
+        
+        # self_destruct frees each Arrow column once converted; the table
+        # must not be used afterwards
+        return table.to_pandas(self_destruct=True, split_blocks=True)
+    
     def clean_text(self, text: str) -> str:
-        """Clean and preprocess text data.
+        """Clean a single text value.
+        
+        This is the scalar counterpart of the cleaning done in
+        preprocess_data, which works on a whole column at once and relies on
+        the string dtype instead of per-value type checks.
         
         Args:
             text: Input text to clean (can be any type)
             
         Returns:
-            Cleaned text or empty string if input is not a string
+            Cleaned text; other values are converted with str() first, and
+            missing values (None, NaN, pd.NA) become an empty string
         """
-        # Return empty string for non-string inputs
         if not isinstance(text, str):
-            return ""
+            # Return empty string for missing values, as preprocess_data does
+            if text is None or (pd.api.types.is_scalar(text) and pd.isna(text)):
+                return ""
+            text = str(text)
             
         # Basic text cleaning
-        text = text.strip()
-        
-        # Return the text if not empty after stripping, otherwise return empty string
-        return text if text else ""
+        return ZERO_WIDTH_RE.sub("", text).strip()
     
     def preprocess_data(self, df: pd.DataFrame, 
                        text_column: str = "text",
@@ -89,30 +265,45 @@ class DataProcessor:
         """
         logger.info("Preprocessing data...")
         
-        # Make a copy to avoid modifying the original
-        df = df.copy()
+        # Clean text data with vectorized Arrow kernels; non-string values
+        # are coerced to strings and missing values become empty strings.
+        # The regex is passed as a string: pandas falls back to a per-row
+        # Python loop for compiled patterns.
+        cleaned = (df[text_column]
+                   .astype("string[pyarrow]")
+                   .str.replace(ZERO_WIDTH_RE.pattern, "", regex=True)
+                   .str.strip()
+                   .fillna(""))
         
-        # Clean text data
-        df[text_column] = df[text_column].apply(self.clean_text)
+        # Swap the cleaned column into a shallow copy: the caller's frame is
+        # left untouched without deep-copying every other column
+        df = df.copy(deep=False)
+        df[text_column] = cleaned
         
         # Map labels to standard format if needed
         # Example: df[label_column] = df[label_column].map({'en': 'english', 'sn': 'shona'})
         
-        # Drop rows with empty text
-        df = df[df[text_column].str.strip().astype(bool)]
-        
-        # Reset index after dropping rows
-        df = df.reset_index(drop=True)
+        # Drop rows with empty text (already stripped above, so a length
+        # check is enough). Byte lengths come straight from the Arrow offsets
+        # buffer, so the character data itself is never read.
+        byte_lengths = pc.binary_length(pa.array(df[text_column]))
+        df = df[pc.greater(byte_lengths, 0).to_numpy(zero_copy_only=False)]
         
+        # The original index is kept; splitting works on row positions and
+        # splits are saved without the index, so there is no need to reset it
         return df
     
     def train_val_test_split(self, 
                            df: pd.DataFrame,
                            test_size: float = 0.2,
                            val_size: float = 0.1,
-                           random_state: int = 42) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+                           random_state: int = 42) -> Tuple[pd.DataFrame, Optional[pd.DataFrame], pd.DataFrame]:
         """Split data into training, validation, and test sets.
         
+        The splits are computed over integer row positions with a NumPy
+        stratified shuffle and taken from the input with a single iloc each,
+        so the frame is never copied as a whole.
+        
         Args:
             df: Input DataFrame
             test_size: Proportion of data to use for testing
@@ -120,52 +311,56 @@ class DataProcessor:
             random_state: Random seed for reproducibility
             
         Returns:
-            Tuple of (train_df, val_df, test_df)
+            Tuple of (train_df, val_df, test_df); val_df is None when no
+            validation set is produced
+            
+        Raises:
+            ValueError: If the DataFrame is empty
         """
-        logger.info(f"Splitting data (train/val/test): {1-test_size-val_size}/{val_size}/{test_size}")
+        if len(df) == 0:
+            raise ValueError("Cannot split an empty dataset")
         
-        # First split: training + validation vs test
-        train_val_df, test_df = train_test_split(
-            df, 
-            test_size=test_size,
-            random_state=random_state,
-            stratify=df['language'] if 'language' in df.columns else None
-        )
+        logger.info(f"Splitting data (train/val/test): "
+                   f"{(1-test_size)*(1-val_size):.2f}/{(1-test_size)*val_size:.2f}/{test_size:.2f}")
         
-        # Second split: training vs validation
-        if val_size > 0:
-            # Calculate the ratio for the second split
-            val_ratio = val_size / (1 - test_size)
-            
-            # Ensure we have enough samples for the split
-            if len(train_val_df) * val_ratio < 1:
-                # If we don't have enough samples for a proper validation set,
-                # just return all data as training and empty validation
-                return train_val_df, pd.DataFrame(), test_df
-                
-            train_df, val_df = train_test_split(
-                train_val_df,
-                test_size=val_ratio,
-                random_state=random_state,
-                stratify=train_val_df['language'] if 'language' in train_val_df.columns else None
-            )
-            return train_df, val_df, test_df
+        # Stratify on the language labels when they are available; missing
+        # labels form a class of their own
+        if 'language' in df.columns:
+            labels, _ = pd.factorize(df['language'], use_na_sentinel=False)
+        else:
+            labels = np.zeros(len(df), dtype=np.int64)
+        
+        # Skip the validation set if we don't have enough samples for it
+        n_train_val = len(df) - int(round(test_size * len(df)))
+        if val_size > 0 and n_train_val * val_size < 1:
+            val_size = 0
         
-        return train_val_df, pd.DataFrame(), test_df
+        rng = np.random.default_rng(random_state)
+        train_idx, val_idx, test_idx = _stratified_indices(labels, test_size, val_size, rng)
+        
+        train_df = df.iloc[train_idx]
+        val_df = df.iloc[val_idx] if val_size > 0 else None
+        test_df = df.iloc[test_idx]
+        return train_df, val_df, test_df
     
     def save_splits(self, 
                    train_df: pd.DataFrame, 
-                   val_df: pd.DataFrame, 
+                   val_df: Optional[pd.DataFrame], 
                    test_df: pd.DataFrame,
-                   output_dir: str = None) -> None:
+                   output_dir: str = None,
+                   format: str = "parquet") -> None:
         """Save the split datasets to disk.
         
         Args:
             train_df: Training data
-            val_df: Validation data (can be empty)
+            val_df: Validation data (can be None or empty)
             test_df: Test data
             output_dir: Directory to save the split files
+            format: Output file format, "parquet" (zstd-compressed) or "csv"
         """
+        if format not in ("parquet", "csv"):
+            raise ValueError(f"Unsupported output format: {format}")
+        
         if output_dir is None:
             output_dir = self.splits_dir
         else:
@@ -174,15 +369,21 @@ class DataProcessor:
         
         logger.info(f"Saving split datasets to {output_dir}")
         
-        # Save each split to a CSV file
-        train_df.to_csv(output_dir / "train.csv", index=False)
-        if not val_df.empty:
-            val_df.to_csv(output_dir / "val.csv", index=False)
-        test_df.to_csv(output_dir / "test.csv", index=False)
+        splits = {"train": train_df, "val": val_df, "test": test_df}
+        for name, split_df in splits.items():
+            if split_df is None or split_df.empty:
+                continue
+            
+            if format == "parquet":
+                split_df.to_parquet(output_dir / f"{name}.parquet",
+                                    engine="pyarrow", compression="zstd", index=False)
+            else:
+                split_df.to_csv(output_dir / f"{name}.csv", index=False)
         
         # Log dataset sizes
+        val_len = len(val_df) if val_df is not None else 0
         logger.info(f"Dataset sizes - Train: {len(train_df):,}, "
-                   f"Val: {len(val_df):,}, Test: {len(test_df):,}")
+                   f"Val: {val_len:,}, Test: {len(test_df):,}")
     
     def process_pipeline(self, 
                         input_file: str,
@@ -190,7 +391,9 @@ class DataProcessor:
                         label_column: str = "language",
                         test_size: float = 0.2,
                         val_size: float = 0.1,
-                        random_state: int = 42) -> Dict[str, pd.DataFrame]:
+                        random_state: int = 42,
+                        chunksize: Optional[int] = None,
+                        output_format: str = "parquet") -> Dict[str, Optional[pd.DataFrame]]:
         """Run the complete data processing pipeline.
         
         Args:
@@ -200,19 +403,36 @@ class DataProcessor:
             test_size: Proportion of data for testing
             val_size: Proportion of training data for validation
             random_state: Random seed for reproducibility
+            chunksize: If set, load and preprocess the input in chunks of this
+                many rows so only the cleaned rows are kept in memory
+            output_format: File format for the saved splits ("parquet" or "csv")
             
         Returns:
             Dictionary containing the processed data splits
         """
-        # Load data
-        df = self.load_data(input_file)
-        
-        # Preprocess data
-        processed_df = self.preprocess_data(
-            df, 
-            text_column=text_column, 
-            label_column=label_column
-        )
+        if chunksize is None:
+            # Load data
+            df = self.load_data(input_file, text_column=text_column)
+            
+            # Preprocess data
+            processed_df = self.preprocess_data(
+                df, 
+                text_column=text_column, 
+                label_column=label_column
+            )
+        else:
+            # Load and preprocess chunk by chunk, keeping only surviving rows
+            chunks = []
+            rows_read = 0
+            for chunk in self.load_data(input_file, chunksize=chunksize, text_column=text_column):
+                rows_read += len(chunk)
+                chunks.append(self.preprocess_data(
+                    chunk,
+                    text_column=text_column,
+                    label_column=label_column
+                ))
+            processed_df = pd.concat(chunks)
+            logger.info(f"Kept {len(processed_df):,} of {rows_read:,} rows")
         
         # Split data
         train_df, val_df, test_df = self.train_val_test_split(
@@ -223,7 +443,7 @@ class DataProcessor:
         )
         
         # Save splits
-        self.save_splits(train_df, val_df, test_df)
+        self.save_splits(train_df, val_df, test_df, format=output_format)
         
         return {
             'train': train_df,
@@ -250,6 +470,11 @@ def main():
                        help='Random seed for reproducibility')
     parser.add_argument('--output-dir', type=str, default=None,
                        help='Directory to save the processed data')
+    parser.add_argument('--chunksize', type=int, default=None,
+                       help=f'Stream the input in chunks of this many rows '
+                            f'(e.g. {DEFAULT_CHUNKSIZE}); loads it whole if omitted')
+    parser.add_argument('--format', type=str, default='parquet', choices=['parquet', 'csv'],
+                       help='File format for the saved splits')
     
     args = parser.parse_args()
     
@@ -263,7 +488,9 @@ def main():
         label_column=args.label_col,
         test_size=args.test_size,
         val_size=args.val_size,
-        random_state=args.random_state
+        random_state=args.random_state,
+        chunksize=args.chunksize,
+        output_format=args.format
     )
     
     logger.info("Data processing completed successfully!")
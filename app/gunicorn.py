@@ -2,9 +2,13 @@ import os
 
 # Gunicorn config variables
 loglevel = os.environ.get("LOG_LEVEL", "info")
-workers = int(os.environ.get("GUNICORN_PROCESSES", "2"))
+# Default to gunicorn's (2 x cores) + 1 sizing heuristic
+workers = int(os.environ.get("GUNICORN_PROCESSES", (os.cpu_count() or 1) * 2 + 1))
+worker_class = "uvicorn.workers.UvicornWorker"  # ASGI worker for the FastAPI app
 timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
 bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+# Load the app before forking so model weights are shared copy-on-write
+preload_app = True
 
 # For debugging and testing
 logconfig_dict = {
@@ -1,29 +1,32 @@
 # huggingface_publisher.py (compatible with huggingface_hub 1.1.5)
 import os
-import shutil
-from huggingface_hub import login, HfApi
+import warnings
+from huggingface_hub import login, HfApi, CommitOperationAdd
+
+def publish_dataset(hf_token, repo_id, dataset_files, readme_file="README.md", local_dir=None, num_threads=8):
+    # local_dir is kept for backwards compatibility; files are no longer staged locally
+    if local_dir is not None:
+        warnings.warn(
+            "local_dir is deprecated and ignored; files are uploaded from their source paths",
+            DeprecationWarning,
+            stacklevel=2
+        )
 
-def publish_dataset(hf_token, repo_id, dataset_files, readme_file="README.md", local_dir="hf_dataset_upload"):
     # 1️⃣ Login
     login(token=hf_token)
     print("Logged in to Hugging Face Hub.")
 
-    # 2️⃣ Prepare local folder
-    os.makedirs(local_dir, exist_ok=True)
-
-    # Copy dataset files
+    # 2️⃣ Collect files to upload straight from their source paths
+    upload_files = []
     for file_path in dataset_files:
         if os.path.isfile(file_path):
-            shutil.copy(file_path, local_dir)
-            print(f"Copied {file_path} to {local_dir}")
+            upload_files.append(file_path)
         else:
             raise FileNotFoundError(f"Dataset file not found: {file_path}")
 
-    # Copy README
     if readme_file:
         if os.path.isfile(readme_file):
-            shutil.copy(readme_file, local_dir)
-            print(f"Copied {readme_file} to {local_dir}")
+            upload_files.append(readme_file)
         else:
             print(f"WARNING: README file not found: {readme_file}")
 
@@ -32,18 +35,22 @@ def publish_dataset(hf_token, repo_id, dataset_files, readme_file="README.md", l
     api.create_repo(repo_id=repo_id, repo_type="dataset", exist_ok=True)
     print(f"Dataset repo {repo_id} ready.")
 
-    # 4️⃣ Upload files individually (better for large files)
-    for filename in os.listdir(local_dir):
-        file_path = os.path.join(local_dir, filename)
-        print(f"Uploading {filename}...")
-        api.upload_file(
-            path_or_fileobj=file_path,
-            path_in_repo=filename,
-            repo_id=repo_id,
-            repo_type="dataset",
-            token=hf_token
-        )
-        print(f"Uploaded {filename} ✅")
+    # 4️⃣ Upload all files in one commit; the hub client uploads them in parallel
+    operations = []
+    for file_path in upload_files:
+        filename = os.path.basename(file_path)
+        print(f"Queued {filename} for upload")
+        operations.append(CommitOperationAdd(path_in_repo=filename, path_or_fileobj=file_path))
+
+    api.create_commit(
+        repo_id=repo_id,
+        operations=operations,
+        commit_message=f"Upload {len(operations)} dataset files",
+        repo_type="dataset",
+        token=hf_token,
+        num_threads=num_threads
+    )
+    print(f"Uploaded {len(operations)} files ✅")
 
     print(f"Dataset successfully pushed: https://huggingface.co/datasets/{repo_id}")
 
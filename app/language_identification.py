@@ -1,5 +1,39 @@
 # Placeholder for language identification logic
+from typing import List
+
+from app.batching import MicroBatcher
+from app.cache import LRUCache
+
+# Recent results keyed by text; identification is a pure function of the text.
+# Only short texts are cached: keys and results hold the full text, so this
+# caps the cache at roughly maxsize x MAX_CACHED_TEXT_LENGTH characters.
+MAX_CACHED_TEXT_LENGTH = 512
+result_cache = LRUCache(maxsize=100_000)
+
+def _cacheable(text: str) -> bool:
+    return len(text) <= MAX_CACHED_TEXT_LENGTH
 
 def identify_language(text: str) -> dict:
     # In a real implementation, this would use a model to identify the language
     return {"language": "unknown", "confidence": 0.0, "text": text}
+
+def identify_language_batch(texts: List[str]) -> List[dict]:
+    results = [result_cache.get(text) if _cacheable(text) else None for text in texts]
+    misses = [i for i, result in enumerate(results) if result is None]
+
+    # In a real implementation, this would run the model once over the cache misses
+    for i in misses:
+        results[i] = identify_language(texts[i])
+        if _cacheable(texts[i]):
+            result_cache.put(texts[i], results[i])
+    return results
+
+# Coalesces concurrent single-text requests into one batched model call
+identify_batcher = MicroBatcher(identify_language_batch)
+
+async def identify_language_async(text: str) -> dict:
+    # Answer repeated texts from the cache; batch everything else
+    cached = result_cache.get(text) if _cacheable(text) else None
+    if cached is not None:
+        return cached
+    return await identify_batcher.submit(text)
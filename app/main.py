@@ -1,21 +1,30 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends
 from pydantic import BaseModel
+import msgspec
 from typing import List, Optional
-import sys
-import os
 
-# Add parent directory to path to import modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from app.language_identification import identify_language
+from app.language_identification import identify_batcher, identify_language_async, identify_language_batch
 from app.model_publisher import publish_model
+from app.msgspec_body import msgspec_body
 from app.huggingface_publisher import publish_dataset
 
-app = FastAPI(title="Language Identification API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await identify_batcher.close()
+
+app = FastAPI(title="Language Identification API", lifespan=lifespan)
 
-class TextInput(BaseModel):
+# Decoded with msgspec: much faster than Pydantic on the hot /identify/ path
+class TextInput(msgspec.Struct):
     text: str
 
+decode_text_input, TEXT_INPUT_OPENAPI = msgspec_body(TextInput)
+
+class BatchTextInput(BaseModel):
+    texts: List[str]
+
 class DatasetPublishRequest(BaseModel):
     hf_token: str
     repo_id: str
@@ -31,12 +40,20 @@ class ModelPublishRequest(BaseModel):
 def read_root():
     return {"message": "Language Identification API", "version": "1.0.0"}
 
-@app.post("/identify/")
-def identify_language_endpoint(text_input: TextInput):
+@app.post(
+    "/identify/",
+    openapi_extra=TEXT_INPUT_OPENAPI,
+)
+async def identify_language_endpoint(text_input: TextInput = Depends(decode_text_input)):
     """Identify the language of the given text"""
-    result = identify_language(text_input.text)
+    result = await identify_language_async(text_input.text)
     return result
 
+@app.post("/identify/batch/")
+def identify_language_batch_endpoint(batch_input: BatchTextInput):
+    """Identify the language of each of the given texts"""
+    return identify_language_batch(batch_input.texts)
+
 @app.post("/publish/dataset/")
 def publish_dataset_endpoint(request: DatasetPublishRequest):
     """Publish a dataset to Hugging Face Hub"""
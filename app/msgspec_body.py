@@ -0,0 +1,62 @@
+"""
+FastAPI request bodies decoded with msgspec.
+Used on hot endpoints where msgspec's decoder is much faster than Pydantic,
+while keeping FastAPI's 422 error format and the OpenAPI request schema.
+"""
+import re
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+import msgspec
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+
+# msgspec reports error locations as a JSONPath suffix, e.g. " - at `$.texts[0]`"
+_ERROR_PATH_RE = re.compile(r"^(?P<msg>.*?)(?: - at `\$(?P<path>[^`]*)`)?$", re.DOTALL)
+_PATH_PART_RE = re.compile(r"\.([^.\[]+)|\[(\d+)\]")
+_MISSING_FIELD_RE = re.compile(r"^Object missing required field `(?P<field>[^`]+)`$")
+
+
+def _validation_errors(error: msgspec.DecodeError) -> List[Dict[str, Any]]:
+    """Convert a msgspec error into FastAPI's list of {type, loc, msg} errors."""
+    if not isinstance(error, msgspec.ValidationError):
+        return [{"type": "json_invalid", "loc": ["body"], "msg": "JSON decode error",
+                 "input": {}, "ctx": {"error": str(error)}}]
+
+    match = _ERROR_PATH_RE.match(str(error))
+    msg, path = match.group("msg"), match.group("path") or ""
+    loc: List[Any] = ["body"]
+    for name, index in _PATH_PART_RE.findall(path):
+        loc.append(name if name else int(index))
+
+    missing = _MISSING_FIELD_RE.match(msg)
+    if missing:
+        loc.append(missing.group("field"))
+        return [{"type": "missing", "loc": loc, "msg": "Field required"}]
+    return [{"type": "value_error", "loc": loc, "msg": msg}]
+
+
+def msgspec_body(struct_type: Type[msgspec.Struct]) -> Tuple[Callable, Dict[str, Any]]:
+    """Build a body dependency and its OpenAPI description for a msgspec Struct.
+
+    Args:
+        struct_type: The msgspec Struct the JSON body is decoded into
+
+    Returns:
+        Tuple of (dependency, openapi_extra); use the dependency with
+        Depends() and pass openapi_extra to the route decorator
+    """
+    decoder = msgspec.json.Decoder(struct_type)
+
+    async def decode_body(request: Request) -> struct_type:
+        try:
+            return decoder.decode(await request.body())
+        except msgspec.DecodeError as e:
+            raise RequestValidationError(_validation_errors(e))
+
+    # Generate the schema from the struct itself so the docs cannot drift
+    _, components = msgspec.json.schema_components([struct_type])
+    openapi_extra = {"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": components[struct_type.__name__]}},
+    }}
+    return decode_body, openapi_extra
@@ -1,19 +1,29 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends
 from pydantic import BaseModel, Field
-from typing import List
+import msgspec
+from typing import Annotated, List
 import os
 from dotenv import load_dotenv
 
 from app.huggingface_publisher import publish_dataset
-from app.language_identification import identify_language
+from app.language_identification import identify_batcher, identify_language_async, identify_language_batch
 from app.model_publisher import publish_model
+from app.msgspec_body import msgspec_body
 
 load_dotenv()  # Load environment variables from .env file
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await identify_batcher.close()
+
 app = FastAPI(
     title="Language Services API",
     description="An API for language identification and publishing models and datasets to the Hugging Face Hub.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # --- Pydantic Models ---
@@ -27,8 +37,8 @@ class ModelPublishRequest(BaseModel):
     repo_id: str = Field(..., example="omanyasa/bantu-lang-id-model")
     model_path: str = Field(..., example="./models/my_model")
 
-class LangIdRequest(BaseModel):
-    text: str = Field(..., example="Ndiri kudzidza chiShona.")
+class BatchLangIdRequest(BaseModel):
+    texts: List[str] = Field(..., example=["Ndiri kudzidza chiShona.", "I am learning Shona."])
 
 class PublisherResponse(BaseModel):
     message: str
@@ -39,6 +49,15 @@ class LangIdResponse(BaseModel):
     confidence: float
     text: str
 
+# --- msgspec Models ---
+# The hot /identify/ path decodes its body with msgspec, which is much faster
+# than Pydantic for small payloads.
+
+class LangIdRequest(msgspec.Struct):
+    text: Annotated[str, msgspec.Meta(examples=["Ndiri kudzidza chiShona."])]
+
+decode_lang_id_request, LANG_ID_REQUEST_OPENAPI = msgspec_body(LangIdRequest)
+
 # --- Dependencies ---
 
 def get_hf_token():
@@ -49,21 +68,34 @@ def get_hf_token():
 
 # --- API Endpoints ---
 
-@app.post("/identify/", response_model=LangIdResponse)
-async def identify_language_endpoint(request: LangIdRequest):
+@app.post(
+    "/identify/",
+    response_model=LangIdResponse,
+    openapi_extra=LANG_ID_REQUEST_OPENAPI,
+)
+async def identify_language_endpoint(request: LangIdRequest = Depends(decode_lang_id_request)):
     """
     Identifies the language of a given text.
     """
-    result = identify_language(request.text)
+    result = await identify_language_async(request.text)
     return result
 
+@app.post("/identify/batch/", response_model=List[LangIdResponse])
+def identify_language_batch_endpoint(request: BatchLangIdRequest):
+    """
+    Identifies the language of each text in a batch.
+    """
+    return identify_language_batch(request.texts)
+
 @app.post("/publish/dataset/", response_model=PublisherResponse)
 async def publish_dataset_endpoint(dataset: DatasetPublishRequest, hf_token: str = Depends(get_hf_token)):
     """
     Publishes a dataset to the Hugging Face Hub.
     """
     try:
-        publish_dataset(
+        # Run the blocking upload in a worker thread so the event loop stays free
+        await asyncio.to_thread(
+            publish_dataset,
             hf_token=hf_token,
             repo_id=dataset.repo_id,
             dataset_files=dataset.dataset_files,
@@ -84,7 +116,8 @@ async def publish_model_endpoint(model: ModelPublishRequest, hf_token: str = Dep
     Publishes a model to the Hugging Face Hub.
     """
     try:
-        publish_model(
+        await asyncio.to_thread(
+            publish_model,
             hf_token=hf_token,
             repo_id=model.repo_id,
             model_path=model.model_path
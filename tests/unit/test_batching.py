@@ -0,0 +1,115 @@
+"""
+Unit tests for the batching module.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from app.batching import MicroBatcher
+
+
+def test_micro_batcher_coalesces_requests():
+    """Test that concurrent submissions share one batched call."""
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(batch_fn, max_batch_size=10, max_wait=0.05)
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(run())
+
+    assert results == [0, 2, 4, 6, 8]
+    assert calls == [[0, 1, 2, 3, 4]]
+
+
+def test_micro_batcher_respects_max_batch_size():
+    """Test that batches are capped at max_batch_size."""
+    calls = []
+
+    def batch_fn(items):
+        calls.append(len(items))
+        return items
+
+    async def run():
+        batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait=0.05)
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(run())
+
+    assert results == [0, 1, 2, 3, 4]
+    assert calls == [2, 2, 1]
+
+
+def test_micro_batcher_propagates_errors():
+    """Test that a failing batch call raises in every waiting request."""
+    def batch_fn(items):
+        raise RuntimeError("model failed")
+
+    async def run():
+        batcher = MicroBatcher(batch_fn)
+        try:
+            await batcher.submit("text")
+        finally:
+            await batcher.close()
+
+    with pytest.raises(RuntimeError, match="model failed"):
+        asyncio.run(run())
+
+
+def test_micro_batcher_rejects_wrong_result_count():
+    """Test that a result count mismatch fails every waiting request."""
+    def batch_fn(items):
+        return items[:1]
+
+    async def run():
+        batcher = MicroBatcher(batch_fn, max_wait=0.05)
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(batcher.submit("a"), batcher.submit("b"),
+                               return_exceptions=True),
+                timeout=1
+            )
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_micro_batcher_close_fails_pending_requests():
+    """Test that closing the batcher fails queued and in-flight requests."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def batch_fn(items):
+        started.set()
+        release.wait(timeout=1)
+        return items
+
+    async def run():
+        batcher = MicroBatcher(batch_fn, max_batch_size=1, max_wait=0)
+        in_flight = asyncio.ensure_future(batcher.submit("a"))
+        queued = asyncio.ensure_future(batcher.submit("b"))
+        await asyncio.to_thread(started.wait, 1)
+        await batcher.close()
+        release.set()
+        return await asyncio.wait_for(
+            asyncio.gather(in_flight, queued, return_exceptions=True),
+            timeout=1
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,31 @@
+"""
+Unit tests for the cache module.
+"""
+from app.cache import LRUCache
+
+
+def test_lru_cache_get_put():
+    """Test basic storage and lookup."""
+    cache = LRUCache(maxsize=2)
+
+    assert cache.get("missing") is None
+
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert len(cache) == 1
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that the least recently used entry is evicted when full."""
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    # Touch "a" so "b" becomes the least recently used entry
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
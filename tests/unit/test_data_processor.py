@@ -5,13 +5,9 @@ import os
 import tempfile
 import pandas as pd
 import pytest
-from pathlib import Path
 
-# Add the app directory to the Python path
-import sys
-sys.path.append(str(Path(__file__).parent.parent.parent / 'app'))
-
-from data_processor import DataProcessor
+from app import data_processor
+from app.data_processor import DataProcessor
 
 # Sample test data
 TEST_DATA = """text,language
@@ -43,7 +39,16 @@ def test_data_processor_init():
     assert processor.processed_dir.exists()
     assert processor.splits_dir.exists()
 
-def test_load_data_csv(sample_data_file):
+@pytest.fixture(params=["polars", "pandas"])
+def reader_backend(request, monkeypatch):
+    """Run a test with the polars readers and with the pandas fallback."""
+    if request.param == "pandas":
+        monkeypatch.setattr(data_processor, "pl", None)
+    elif data_processor.pl is None:
+        pytest.skip("polars is not installed")
+    return request.param
+
+def test_load_data_csv(sample_data_file, reader_backend):
     """Test loading data from a CSV file."""
     processor = DataProcessor()
     df = processor.load_data(sample_data_file)
@@ -53,6 +58,66 @@ def test_load_data_csv(sample_data_file):
     assert 'text' in df.columns
     assert 'language' in df.columns
 
+def test_load_data_csv_mixed_types(tmp_path, reader_backend):
+    """Test loading a CSV whose text column starts with many numeric rows."""
+    processor = DataProcessor()
+    
+    path = tmp_path / "mixed.csv"
+    path.write_text("text,language,score\n"
+                    + "".join(f"{i},en,{i / 2}\n" for i in range(200))
+                    + "hello world,sn,0.5\n")
+    df = processor.load_data(str(path))
+    
+    assert len(df) == 201
+    assert str(df['text'].iloc[-1]) == 'hello world'
+    
+    # Non-text columns keep their inferred numeric type with either reader
+    assert pd.api.types.is_float_dtype(df['score'])
+    assert df['score'].iloc[-1] == 0.5
+
+def test_load_data_jsonl(tmp_path, reader_backend):
+    """Test loading data from a JSON Lines file."""
+    processor = DataProcessor()
+    
+    path = tmp_path / "data.jsonl"
+    path.write_text('{"text": "Hello", "language": "en"}\n'
+                    '{"text": "Mhoro", "language": "sn"}\n')
+    df = processor.load_data(str(path))
+    
+    assert isinstance(df, pd.DataFrame)
+    assert len(df) == 2
+    assert list(df['text']) == ['Hello', 'Mhoro']
+
+def test_load_data_jsonl_mixed_types(tmp_path, reader_backend):
+    """Test loading JSON Lines whose text field starts with many numbers."""
+    processor = DataProcessor()
+    
+    path = tmp_path / "mixed.jsonl"
+    path.write_text("".join(f'{{"text": {i}, "language": "en"}}\n' for i in range(200))
+                    + '{"text": "hello world", "language": "sn"}\n')
+    df = processor.load_data(str(path))
+    
+    assert len(df) == 201
+    assert str(df['text'].iloc[-1]) == 'hello world'
+
+def test_load_data_chunked(sample_data_file):
+    """Test streaming a CSV file in chunks."""
+    processor = DataProcessor()
+    chunks = list(processor.load_data(sample_data_file, chunksize=3))
+    
+    assert [len(chunk) for chunk in chunks] == [3, 3, 2]
+    assert all(isinstance(chunk, pd.DataFrame) for chunk in chunks)
+
+def test_load_data_mmap(sample_data_file):
+    """Test loading a CSV file through a memory map."""
+    processor = DataProcessor()
+    df = processor.load_data_mmap(sample_data_file)
+    
+    assert isinstance(df, pd.DataFrame)
+    assert len(df) == 8
+    assert list(df.columns) == ['text', 'language']
+    assert df['text'].iloc[1] == 'Mhoro, makadii?'
+
 def test_clean_text():
     """Test text cleaning functionality."""
     processor = DataProcessor()
@@ -61,8 +126,17 @@ def test_clean_text():
     assert processor.clean_text("  Hello!  ") == "Hello!"
     assert processor.clean_text("") == ""
     assert processor.clean_text("   ") == ""
-    assert processor.clean_text(123) == ""
     assert processor.clean_text(None) == ""
+    
+    # Test non-string values, which are kept as text like in preprocess_data
+    assert processor.clean_text(123) == "123"
+    assert processor.clean_text(1.5) == "1.5"
+    assert processor.clean_text(float("nan")) == ""
+    assert processor.clean_text(pd.NA) == ""
+    
+    # Test zero-width character removal
+    assert processor.clean_text("\u200bMhoro\ufeff ") == "Mhoro"
+    assert processor.clean_text(" \u200b\u200d ") == ""
 
 def test_preprocess_data():
     """Test data preprocessing."""
@@ -82,6 +156,29 @@ def test_preprocess_data():
     assert len(processed_df) == 3  # Only 3 valid rows
     assert all(processed_df['text'].str.strip().astype(bool))  # No empty strings
 
+def test_preprocess_data_zero_width():
+    """Test that zero-width characters are removed during preprocessing."""
+    processor = DataProcessor()
+    
+    df = pd.DataFrame({
+        'text': ['\u200bMhoro\u200c', '\ufeff', ' Hello\u200f '],
+        'language': ['sn', 'sn', 'en']
+    })
+    processed_df = processor.preprocess_data(df)
+    
+    assert list(processed_df['text']) == ['Mhoro', 'Hello']
+
+def test_clean_text_matches_preprocess_data():
+    """Test that clean_text and preprocess_data clean values the same way."""
+    processor = DataProcessor()
+    
+    values = ['  Hello ', '\u200bMhoro', None, 123, 1.5, float('nan'), '   ']
+    df = pd.DataFrame({'text': values, 'language': ['en'] * len(values)})
+    processed_df = processor.preprocess_data(df)
+    
+    expected = [processor.clean_text(value) for value in values]
+    assert list(processed_df['text']) == [text for text in expected if text]
+
 def test_train_val_test_split():
     """Test data splitting functionality."""
     processor = DataProcessor()
@@ -115,6 +212,53 @@ def test_train_val_test_split():
     sn_count = len(train_df[train_df['language'] == 'sn'])
     assert abs(en_count - sn_count) <= 2, f"Class imbalance too large: {en_count} en vs {sn_count} sn"
 
+def test_train_val_test_split_no_val():
+    """Test splitting without a validation set."""
+    processor = DataProcessor()
+    
+    df = pd.DataFrame({
+        'text': [f'sample_{i}' for i in range(100)],
+        'language': ['en' if i % 2 == 0 else 'sn' for i in range(100)]
+    })
+    
+    train_df, val_df, test_df = processor.train_val_test_split(df, test_size=0.2, val_size=0)
+    
+    assert val_df is None
+    assert len(train_df) == 80
+    assert len(test_df) == 20
+    assert set(train_df['text']).isdisjoint(test_df['text'])
+
+def test_train_val_test_split_imbalanced():
+    """Test that stratification holds for imbalanced classes."""
+    processor = DataProcessor()
+    
+    df = pd.DataFrame({
+        'text': [f'sample_{i}' for i in range(1000)],
+        'language': ['en'] * 900 + ['sn'] * 100
+    })
+    
+    train_df, val_df, test_df = processor.train_val_test_split(
+        df, test_size=0.2, val_size=0.1, random_state=0
+    )
+    
+    assert (len(train_df), len(val_df), len(test_df)) == (720, 80, 200)
+    assert (test_df['language'] == 'sn').sum() == 20
+    assert (val_df['language'] == 'sn').sum() == 8
+    
+    # Every row lands in exactly one split
+    all_texts = pd.concat([train_df, val_df, test_df])['text']
+    assert sorted(all_texts) == sorted(df['text'])
+
+def test_train_val_test_split_empty():
+    """Test that splitting an empty dataset fails with a clear error."""
+    processor = DataProcessor()
+    
+    df = pd.DataFrame({'text': [], 'language': []})
+    
+    with pytest.raises(ValueError, match="empty dataset"):
+        processor.train_val_test_split(df)
+
+
 def test_save_splits(tmp_path):
     """Test saving split datasets."""
     processor = DataProcessor()
@@ -128,6 +272,29 @@ def test_save_splits(tmp_path):
     output_dir = tmp_path / "test_splits"
     processor.save_splits(train_df, val_df, test_df, output_dir=str(output_dir))
     
+    # Check that files were created
+    assert (output_dir / 'train.parquet').exists()
+    assert (output_dir / 'val.parquet').exists()
+    assert (output_dir / 'test.parquet').exists()
+    
+    # Check that the data was saved correctly
+    loaded_train = processor.load_data(str(output_dir / 'train.parquet'))
+    assert len(loaded_train) == 2
+    assert 'train1' in loaded_train['text'].values
+
+def test_save_splits_csv(tmp_path):
+    """Test saving split datasets as CSV."""
+    processor = DataProcessor()
+    
+    # Create test DataFrames
+    train_df = pd.DataFrame({'text': ['train1', 'train2'], 'language': ['en', 'sn']})
+    val_df = pd.DataFrame({'text': ['val1', 'val2'], 'language': ['en', 'sn']})
+    test_df = pd.DataFrame({'text': ['test1', 'test2'], 'language': ['en', 'sn']})
+    
+    # Save the splits
+    output_dir = tmp_path / "test_splits"
+    processor.save_splits(train_df, val_df, test_df, output_dir=str(output_dir), format="csv")
+    
     # Check that files were created
     assert (output_dir / 'train.csv').exists()
     assert (output_dir / 'val.csv').exists()
@@ -138,5 +305,38 @@ def test_save_splits(tmp_path):
     assert len(loaded_train) == 2
     assert 'train1' in loaded_train['text'].values
 
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_process_pipeline_chunked(tmp_path, reader_backend, suffix):
+    """Test that chunked processing gives the same rows and texts as a full load."""
+    processor = DataProcessor(data_dir=str(tmp_path / "data"))
+    
+    # Mostly numeric texts with blanks, so some chunks hold only numbers and
+    # missing values
+    texts = [None if i % 10 == 0 else (i if i < 60 else f'sample_{i}') for i in range(100)]
+    df = pd.DataFrame({
+        'text': pd.Series(texts, dtype=object),
+        'language': ['en' if i % 2 == 0 else 'sn' for i in range(100)]
+    })
+    input_file = tmp_path / f"input{suffix}"
+    if suffix == ".csv":
+        df.to_csv(input_file, index=False)
+    else:
+        df.to_json(input_file, orient="records", lines=True)
+    
+    full = processor.process_pipeline(str(input_file))
+    chunked = processor.process_pipeline(str(input_file), chunksize=4)
+    
+    for split in ('train', 'val', 'test'):
+        assert len(chunked[split]) == len(full[split])
+        # Chunks carry continuous row labels and the same cleaned texts, so
+        # results don't depend on chunksize
+        assert chunked[split]['text'].sort_index().tolist() == full[split]['text'].sort_index().tolist()
+        assert sorted(chunked[split].index) == sorted(full[split].index)
+    assert sum(len(df) for df in chunked.values()) == 90
+    
+    all_texts = set(pd.concat(list(chunked.values()))['text'])
+    assert '1' in all_texts
+    assert 'sample_61' in all_texts
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
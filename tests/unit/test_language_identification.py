@@ -0,0 +1,34 @@
+"""
+Unit tests for the language_identification module.
+"""
+import pytest
+
+from app import language_identification
+from app.cache import LRUCache
+from app.language_identification import MAX_CACHED_TEXT_LENGTH, identify_language_batch
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    """Give each test its own empty result cache."""
+    cache = LRUCache(maxsize=10)
+    monkeypatch.setattr(language_identification, "result_cache", cache)
+    return cache
+
+
+def test_identify_language_batch_caches_short_texts(empty_cache):
+    """Test that results for short texts are cached."""
+    results = identify_language_batch(["Mhoro", "Hello"])
+
+    assert [result["text"] for result in results] == ["Mhoro", "Hello"]
+    assert empty_cache.get("Mhoro") == results[0]
+    assert len(empty_cache) == 2
+
+
+def test_identify_language_batch_skips_long_texts(empty_cache):
+    """Test that texts above the length cap are not cached."""
+    long_text = "a" * (MAX_CACHED_TEXT_LENGTH + 1)
+    [result] = identify_language_batch([long_text])
+
+    assert result["text"] == long_text
+    assert len(empty_cache) == 0
@@ -0,0 +1,85 @@
+"""
+Unit tests for the msgspec_body module.
+"""
+from typing import List
+
+import msgspec
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.msgspec_body import msgspec_body
+
+
+class Item(msgspec.Struct):
+    text: str
+    tags: List[str] = []
+
+
+class PydanticItem(BaseModel):
+    text: str
+
+
+decode_item, ITEM_OPENAPI = msgspec_body(Item)
+
+app = FastAPI()
+
+
+@app.post("/msgspec/", openapi_extra=ITEM_OPENAPI)
+async def msgspec_endpoint(item: Item = Depends(decode_item)):
+    return {"text": item.text, "tags": item.tags}
+
+
+@app.post("/pydantic/")
+def pydantic_endpoint(item: PydanticItem):
+    return {"text": item.text}
+
+
+client = TestClient(app)
+
+
+def test_msgspec_body_decodes_valid_body():
+    """Test that a valid body is decoded into the struct."""
+    response = client.post("/msgspec/", json={"text": "Mhoro", "tags": ["sn"]})
+
+    assert response.status_code == 200
+    assert response.json() == {"text": "Mhoro", "tags": ["sn"]}
+
+
+def test_msgspec_body_missing_field_matches_fastapi():
+    """Test that a missing field is reported like FastAPI's own validation."""
+    msgspec_error = client.post("/msgspec/", json={}).json()["detail"]
+    pydantic_error = client.post("/pydantic/", json={}).json()["detail"]
+
+    for errors in (msgspec_error, pydantic_error):
+        assert len(errors) == 1
+        assert errors[0]["type"] == "missing"
+        assert errors[0]["loc"] == ["body", "text"]
+
+
+def test_msgspec_body_reports_error_location():
+    """Test that nested validation errors carry their location."""
+    response = client.post("/msgspec/", json={"text": "a", "tags": ["ok", 1]})
+
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["loc"] == ["body", "tags", 1]
+    assert {"type", "loc", "msg"} <= error.keys()
+
+
+def test_msgspec_body_malformed_json():
+    """Test that malformed JSON returns a json_invalid error."""
+    response = client.post("/msgspec/", content=b"{bad",
+                           headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+
+
+def test_msgspec_body_openapi_schema():
+    """Test that the documented request schema is generated from the struct."""
+    schema = client.get("/openapi.json").json()
+    body = schema["paths"]["/msgspec/"]["post"]["requestBody"]
+
+    assert body["required"] is True
+    assert body["content"]["application/json"]["schema"] == msgspec.json.schema_components([Item])[1]["Item"]